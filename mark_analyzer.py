@@ -5,7 +5,28 @@ TVP & AGA Mark Analyzer (PyQt5)
 import sys
 import re
 import math
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+import numpy as np
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+if getattr(sys, "frozen", False):
+    # The PyInstaller exe has no on-disk numba cache, so every launch would pay ~0.6 s to import
+    # numba and compile the kernel: more than it saves on typical files. Use the NumPy path there.
+    njit = None
+else:
+    try:
+        from numba import njit
+    except ImportError:
+        njit = None
+try:
+    from mark_parse import scan_mark_line
+except ImportError:
+    scan_mark_line = None
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QCheckBox,
     QFileDialog, QHBoxLayout, QVBoxLayout, QMessageBox
@@ -13,138 +34,272 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 
 # ---------- Parsing & Analysis Logic ----------
-def extract_last_four_floats(tokens: List[str]) -> Tuple[float, float, float, float]:
-    floats = []
-    for tok in reversed(tokens):
-        try:
-            floats.append(float(tok))
-            if len(floats) == 4:
-                break
-        except ValueError:
-            continue
-    if len(floats) < 4:
-        raise ValueError("Not enough numeric tokens (need 4 at end).")
-    x2, y2, x1, y1 = floats[::-1]
-    return x1, y1, x2, y2
+# Layers smaller than this are searched brute-force; building a KD-tree costs more than it saves.
+# The compiled kernel stays ahead of the tree for longer than the NumPy distance matrix does.
+KDTREE_MIN_MARKS = 16
+KDTREE_MIN_MARKS_JIT = 192
+# Neighbours re-fetched for marks whose first KD-tree hits tie: enough to settle the usual
+# grid ties (4 on a square grid, 6 on a hexagonal one) without a ball query.
+KDTREE_QUERY_K = 8
+
+@dataclass(slots=True)
+class Mark:
+    type: str
+    mark: str
+    layer: str
+    center_x: float
+    center_y: float
+    size_x: float
+    size_y: float
+    # Left as "" when the mark is alone on its layer.
+    nearest_name: str = ""
+    nearest_dist: Union[float, str] = ""
+    nearest_angle: Union[float, str] = ""
+    seq: int = 0
 
+# The layer is whatever follows the last Y (TVP) or last X/Y (AGA) in the identifier body;
+# the greedy prefix finds that split inside the match, and group 1 is None when there is none.
+_TVP_RE = re.compile(r"\.TVP(?:[A-Z0-9]*Y([A-Z0-9]*)|[A-Z0-9]+)_NS")
+_AGA_RE = re.compile(r"\.AGA(?:[A-Z0-9]*[XY]([A-Z0-9]*)|[A-Z0-9]+)_NS")
+_MARK_RE = re.compile(rb"_MC_(?P<kind>TVP|AGA)")
+_EOL_RE = re.compile(rb"[\r\n]")
+# Whole whitespace-delimited numeric tokens only, so digits inside identifiers are never picked up.
+_FLOAT_RE = re.compile(r"(?<!\S)[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?!\S)")
+
+@lru_cache(maxsize=4096)
 def parse_layer_from_tvp(identifier: str) -> str:
-    m = re.search(r"\.TVP([A-Z0-9]+)_NS", identifier)
-    if not m:
-        return ""
-    body = m.group(1)
-    pos = body.rfind('Y')
-    return body[pos + 1:] if pos >= 0 else ""
+    m = _TVP_RE.search(identifier)
+    return (m.group(1) or "") if m else ""
 
+@lru_cache(maxsize=4096)
 def parse_layer_from_aga(identifier: str) -> str:
-    m = re.search(r"\.AGA([A-Z0-9]+)_NS", identifier)
-    if not m:
-        return ""
-    body = m.group(1)
-    posY = body.rfind('Y')
-    posX = body.rfind('X')
-    pos = max(posY, posX)
-    return body[pos + 1:] if pos >= 0 else ""
-
-def parse_marks_from_lines(lines: List[str], prefix: str) -> List[Dict]:
+    m = _AGA_RE.search(identifier)
+    return (m.group(1) or "") if m else ""
+
+def _scan_mark_line(raw: str) -> Optional[Tuple[str, float, float, float, float]]:
+    nums = _FLOAT_RE.findall(raw)
+    if len(nums) < 4:
+        return None
+    x2, y2, x1, y1 = map(float, nums[-4:])
+    parts = raw.split(None, 2)
+    return (parts[1] if len(parts) > 1 else ""), x1, y1, x2, y2
+
+if scan_mark_line is None:
+    # mark_parse.pyx is the compiled version of this; it is only present when cythonized.
+    scan_mark_line = _scan_mark_line
+
+def parse_mark_line(raw: str, mark_type: str) -> Optional[Mark]:
+    scanned = scan_mark_line(raw)
+    if scanned is None:
+        return None
+    ident, x1, y1, x2, y2 = scanned
+    if mark_type == "TVP":
+        layer = parse_layer_from_tvp(ident)
+    else:
+        layer = parse_layer_from_aga(ident)
+    return Mark(
+        type=mark_type,
+        mark=ident,
+        layer=layer,
+        center_x=(x1 + x2) / 2.0,
+        center_y=(y1 + y2) / 2.0,
+        size_x=abs(x2 - x1),
+        size_y=abs(y2 - y1)
+    )
+
+def parse_marks_from_lines(lines: List[str], prefix: str) -> List[Mark]:
+    mark_type = "TVP" if prefix == "_MC_TVP" else "AGA"
     records = []
     for raw in lines:
         if prefix in raw:
-            parts = raw.strip().split()
-            ident = parts[1] if len(parts) > 1 else ""
-            try:
-                x1, y1, x2, y2 = extract_last_four_floats(parts)
-            except ValueError:
-                continue
-            cx = (x1 + x2) / 2.0
-            cy = (y1 + y2) / 2.0
-            sx = abs(x2 - x1)
-            sy = abs(y2 - y1)
-            if prefix == "_MC_TVP":
-                layer = parse_layer_from_tvp(ident)
-                mark_type = "TVP"
-            else:
-                layer = parse_layer_from_aga(ident)
-                mark_type = "AGA"
-            records.append({
-                "type": mark_type,
-                "mark": ident,
-                "layer": layer,
-                "center_x": cx,
-                "center_y": cy,
-                "size_x": sx,
-                "size_y": sy
-            })
+            rec = parse_mark_line(raw, mark_type)
+            if rec is not None:
+                records.append(rec)
     return records
 
-def add_nearest_same_layer(records: List[Dict]) -> List[Dict]:
+def parse_file(path: str, want_tvp: bool, want_aga: bool) -> Tuple[List[Mark], List[Mark]]:
+    tvp_records = []
+    aga_records = []
+    sinks = {}
+    if want_tvp:
+        sinks[b"TVP"] = ("TVP", tvp_records.append)
+    if want_aga:
+        sinks[b"AGA"] = ("AGA", aga_records.append)
+    with open(path, "rb") as f:
+        data = f.read()
+    # Hot loop: bind everything it calls to locals once.
+    rfind = data.rfind
+    eol_search = _EOL_RE.search
+    parse = parse_mark_line
+    size = len(data)
+    # Start of the last line parsed per kind, so repeated tags on one line yield one record.
+    last_start = {b"TVP": -1, b"AGA": -1}
+    start = 0
+    prev_end = 0
+    for m in _MARK_RE.finditer(data):
+        tag_start, tag_end = m.span()
+        # Line breaks are \n, \r\n or a bare \r, as with splitlines(). Only the gap since the
+        # previous tag is searched; without a break in it, this tag is on the same line.
+        brk = rfind(b"\n", prev_end, tag_start)
+        brk_cr = rfind(b"\r", prev_end, tag_start)
+        if brk_cr > brk:
+            brk = brk_cr
+        if brk >= 0:
+            start = brk + 1
+        prev_end = tag_end
+        kind = m.group("kind")
+        sink = sinks.get(kind)
+        if sink is None or last_start[kind] == start:
+            continue
+        last_start[kind] = start
+        eol = eol_search(data, tag_end)
+        end = eol.start() if eol else size
+        rec = parse(data[start:end].decode("utf-8", "ignore"), sink[0])
+        if rec is not None:
+            sink[1](rec)
+    return tvp_records, aga_records
+
+def _nearest_kernel(cx, cy, out_idx, out_dist, out_ang):
+    n = cx.shape[0]
+    for i in range(n):
+        best = -1
+        best_d2 = 0.0
+        for j in range(n):
+            if j == i:
+                continue
+            dx = cx[j] - cx[i]
+            dy = cy[j] - cy[i]
+            d2 = dx * dx + dy * dy
+            if best < 0 or d2 < best_d2:
+                best = j
+                best_d2 = d2
+        out_idx[i] = best
+        if best >= 0:
+            out_dist[i] = math.sqrt(best_d2)
+            out_ang[i] = math.atan2(cy[best] - cy[i], cx[best] - cx[i])
+
+if njit is not None:
+    _nearest_kernel = njit(cache=True, nogil=True)(_nearest_kernel)
+else:
+    _nearest_kernel = None
+
+def _angles(cx: np.ndarray, cy: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    return np.degrees(np.arctan2(cy[idx] - cy, cx[idx] - cx))
+
+def _nearest_jit(cx: np.ndarray, cy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(cx)
+    idx = np.empty(n, dtype=np.int64)
+    dist = np.full(n, np.inf)
+    ang = np.zeros(n)
+    _nearest_kernel(cx, cy, idx, dist, ang)
+    return idx, dist, np.degrees(ang)
+
+def _nearest_brute(cx: np.ndarray, cy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(cx)
+    # Squared in place: two N x N temporaries instead of five.
+    d2 = cx[:, None] - cx
+    dy = cy[:, None] - cy
+    d2 *= d2
+    dy *= dy
+    d2 += dy
+    np.fill_diagonal(d2, np.inf)
+    idx = d2.argmin(axis=1)
+    return idx, np.sqrt(d2[np.arange(n), idx]), _angles(cx, cy, idx)
+
+def _tie_radius(dist: np.ndarray) -> np.ndarray:
+    # KD-tree distances can differ from ours in the last bit; widen so equal ones still count.
+    return dist * (1.0 + 1e-9) + 1e-12
+
+def _kdtree_pick(cx: np.ndarray, cy: np.ndarray, rows: np.ndarray, i: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Rank the hits by the squared distance the brute-force paths compare, ignoring the self hit
+    # (coincident marks may come back in either order), and keep the earliest of equal ones.
+    d2 = (cx[i] - cx[rows, None]) ** 2 + (cy[i] - cy[rows, None]) ** 2
+    d2[i == rows[:, None]] = np.inf
+    best = d2.min(axis=1)
+    return np.where(d2 == best[:, None], i, len(cx)).min(axis=1), np.sqrt(best)
+
+def _nearest_kdtree(cx: np.ndarray, cy: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(cx)
+    pts = np.column_stack((cx, cy))
+    tree = cKDTree(pts)
+    d, i = tree.query(pts, k=3)
+    idx, dist = _kdtree_pick(cx, cy, np.arange(n), i)
+    # Where the last hit still ties, an earlier mark may lie beyond it (a square grid has four
+    # equidistant neighbours): re-query those marks for more hits, then fall back to a ball query.
+    tied = np.flatnonzero(d[:, -1] <= _tie_radius(dist))
+    if tied.size and KDTREE_QUERY_K < n:
+        d, i = tree.query(pts[tied], k=KDTREE_QUERY_K)
+        idx[tied], dist[tied] = _kdtree_pick(cx, cy, tied, i)
+        tied = tied[d[:, -1] <= _tie_radius(dist[tied])]
+    for j in tied:
+        cand = np.asarray(sorted(tree.query_ball_point(pts[j], _tie_radius(dist[j]))))
+        cand = cand[cand != j]
+        cand_d2 = (cx[cand] - cx[j]) ** 2 + (cy[cand] - cy[j]) ** 2
+        idx[j] = cand[cand_d2.argmin()]
+        dist[j] = np.sqrt(cand_d2.min())
+    return idx, dist, _angles(cx, cy, idx)
+
+def add_nearest_same_layer(records: List[Mark]) -> List[Mark]:
     by_layer = {}
     for r in records:
-        by_layer.setdefault(r["layer"], []).append(r)
-    for r in records:
-        layer_list = by_layer.get(r["layer"], [])
-        cx, cy = r["center_x"], r["center_y"]
-        nearest = None
-        nearest_d = float("inf")
-        for other in layer_list:
-            if other is r:
-                continue
-            dx = other["center_x"] - cx
-            dy = other["center_y"] - cy
-            d = math.hypot(dx, dy)
-            if d < nearest_d:
-                nearest_d = d
-                nearest = other
-        if nearest is not None and nearest_d < float("inf"):
-            dx = nearest["center_x"] - cx
-            dy = nearest["center_y"] - cy
-            angle = (math.degrees(math.atan2(dy, dx)) + 360.0) % 360.0
-            r["nearest_name"] = nearest["mark"]
-            r["nearest_dist"] = round(nearest_d, 3)
-            r["nearest_angle"] = round(angle, 3)
+        by_layer.setdefault(r.layer, []).append(r)
+    ordered = []
+    append = ordered.append
+    for layer in sorted(by_layer):
+        layer_list = by_layer[layer]
+        if len(layer_list) < 2:
+            r = layer_list[0]
+            r.nearest_name = ""
+            r.nearest_dist = ""
+            r.nearest_angle = ""
+            append(r)
+            r.seq = len(ordered)
+            continue
+        cx = np.asarray([r.center_x for r in layer_list], dtype=np.float64)
+        cy = np.asarray([r.center_y for r in layer_list], dtype=np.float64)
+        tree_min = KDTREE_MIN_MARKS_JIT if _nearest_kernel is not None else KDTREE_MIN_MARKS
+        if cKDTree is not None and len(layer_list) >= tree_min:
+            idx, dist, ang = _nearest_kdtree(cx, cy)
+        elif _nearest_kernel is not None:
+            idx, dist, ang = _nearest_jit(cx, cy)
         else:
-            r["nearest_name"] = ""
-            r["nearest_dist"] = ""
-            r["nearest_angle"] = ""
-    records.sort(key=lambda rr: (rr["layer"], rr["center_x"], rr["center_y"]))
-    for i, rr in enumerate(records, start=1):
-        rr["seq"] = i
+            idx, dist, ang = _nearest_brute(cx, cy)
+        ang = (ang + 360.0) % 360.0
+        found = np.isfinite(dist).tolist()
+        idx = idx.tolist()
+        # Python's round() is correctly rounded; np.round scales by 1000 first and misses half-way values.
+        dist = [round(v, 3) for v in dist.tolist()]
+        ang = [round(v, 3) for v in ang.tolist()]
+        # Layers are visited in sorted order, so sorting each one by (x, y) gives the report order.
+        for i in np.lexsort((cy, cx)).tolist():
+            r = layer_list[i]
+            if found[i]:
+                r.nearest_name = layer_list[idx[i]].mark
+                r.nearest_dist = dist[i]
+                r.nearest_angle = ang[i]
+            else:
+                r.nearest_name = ""
+                r.nearest_dist = ""
+                r.nearest_angle = ""
+            append(r)
+            r.seq = len(ordered)
+    records[:] = ordered
     return records
 
-def html_table_section(title: str, records: List[Dict]) -> str:
-    rows = []
-    for r in records:
-        rows.append(
-            f"<tr>"
-            f"<td>{r['seq']}</td>"
-            f"<td>{r['mark']}</td>"
-            f"<td>{r['layer']}</td>"
-            f"<td>{r['center_x']:.3f}</td>"
-            f"<td>{r['center_y']:.3f}</td>"
-            f"<td>{r['size_x']:.3f}</td>"
-            f"<td>{r['size_y']:.3f}</td>"
-            f"<td>{r['nearest_name']}</td>"
-            f"<td>{r['nearest_dist']}</td>"
-            f"<td>{r['nearest_angle']}</td>"
-            f"</tr>"
-        )
-    table = (
-        f"<h2 id='{title.lower()}'> {title} Marks</h2>"
-        f"<div class='tablewrap'>"
-        f"<table>"
-        f"<thead><tr>"
-        f"<th>Seq</th><th>Mark</th><th>Layer</th>"
-        f"<th>Center X</th><th>Center Y</th>"
-        f"<th>Size X</th><th>Size Y</th>"
-        f"<th>Nearest (Same Layer)</th><th>Dist</th><th>Angle°</th>"
-        f"</tr></thead>"
-        f"<tbody>{''.join(rows)}</tbody>"
-        f"</table>"
-        f"</div>"
-    )
-    return table
+# Mark names come straight from the input file; layers are [A-Z0-9] only and need no escaping.
+_HTML_TRANS = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+# translate() with a multi-char table is slow per character, and almost no names need it.
+_HTML_SPECIAL_RE = re.compile(r'[&<>"]')
+_ROW_TMPL = (
+    "<tr><td>{}</td><td>{}</td><td>{}</td>"
+    "<td>{:.3f}</td><td>{:.3f}</td><td>{:.3f}</td><td>{:.3f}</td>"
+    "<td>{}</td><td>{}</td><td>{}</td></tr>"
+)
+
+def _escape(text: str) -> str:
+    return text.translate(_HTML_TRANS) if _HTML_SPECIAL_RE.search(text) else text
 
-def build_html(tvp_records: List[Dict], aga_records: List[Dict]) -> str:
-    style = """
+_HTML_STYLE = """
     <style>
     body { font-family: Arial, Helvetica, sans-serif; margin: 20px; }
     h1 { font-size: 20px; margin-bottom: 6px; }
@@ -158,28 +313,85 @@ def build_html(tvp_records: List[Dict], aga_records: List[Dict]) -> str:
     nav a { margin-right: 12px; }
     </style>
     """
-    sections = []
-    if tvp_records:
-        sections.append(html_table_section("TVP", tvp_records))
-    if aga_records:
-        sections.append(html_table_section("AGA", aga_records))
+_TABLE_TAIL = "</tbody></table></div>"
+_HTML_TAIL = "</body></html>"
+_NO_MARKS = "<p>No marks selected or found.</p>"
+# Encoded rows are handed to the output file in batches of this many.
+WRITE_FLUSH_ROWS = 1024
+
+def _table_head(title: str) -> str:
+    return (
+        f"<h2 id='{title.lower()}'> {title} Marks</h2>"
+        f"<div class='tablewrap'>"
+        f"<table>"
+        f"<thead><tr>"
+        f"<th>Seq</th><th>Mark</th><th>Layer</th>"
+        f"<th>Center X</th><th>Center Y</th>"
+        f"<th>Size X</th><th>Size Y</th>"
+        f"<th>Nearest (Same Layer)</th><th>Dist</th><th>Angle°</th>"
+        f"</tr></thead>"
+        f"<tbody>"
+    )
+
+def _table_rows(records: List[Mark]) -> Iterator[str]:
+    for r in records:
+        yield _ROW_TMPL.format(
+            r.seq, _escape(r.mark), r.layer,
+            r.center_x, r.center_y, r.size_x, r.size_y,
+            _escape(r.nearest_name), r.nearest_dist, r.nearest_angle
+        )
+
+def _html_head(tvp_records: List[Mark], aga_records: List[Mark]) -> str:
     nav_links = []
     if tvp_records:
         nav_links.append("<a href=\"#tvp\">TVP Section</a>")
     if aga_records:
         nav_links.append("<a href=\"#aga\">AGA Section</a>")
-    html = (
+    return (
         "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
         "<title>TVP & AGA Marks Analysis</title>"
-        f"{style}</head><body>"
+        f"{_HTML_STYLE}</head><body>"
         "<h1>TVP & AGA Marks Analysis Report</h1>"
         f"<nav>{''.join(nav_links)}</nav>"
         "<p class='note'>Columns: Seq, Mark, Layer, Center X/Y, Size X/Y, "
         "Nearest (Same Layer), Dist, Angle°. Sorted by Layer → Center X → Center Y.</p>"
-        f"{''.join(sections) if sections else '<p>No marks selected or found.</p>'}"
-        "</body></html>"
     )
-    return html
+
+def html_table_section(title: str, records: List[Mark], out: Optional[BinaryIO] = None) -> Optional[str]:
+    # Without an output file the section is returned as one string, as before.
+    if out is None:
+        return _table_head(title) + "".join(_table_rows(records)) + _TABLE_TAIL
+    buf = bytearray(_table_head(title).encode("utf-8"))
+    for i, row in enumerate(_table_rows(records), start=1):
+        buf += row.encode("utf-8")
+        if i % WRITE_FLUSH_ROWS == 0:
+            out.write(buf)
+            buf.clear()
+    buf += _TABLE_TAIL.encode("utf-8")
+    out.write(buf)
+    return None
+
+def build_html(tvp_records: List[Mark], aga_records: List[Mark]) -> str:
+    sections = []
+    if tvp_records:
+        sections.append(html_table_section("TVP", tvp_records))
+    if aga_records:
+        sections.append(html_table_section("AGA", aga_records))
+    return (
+        _html_head(tvp_records, aga_records)
+        + ("".join(sections) if sections else _NO_MARKS)
+        + _HTML_TAIL
+    )
+
+def write_html(out_file: BinaryIO, tvp_records: List[Mark], aga_records: List[Mark]) -> None:
+    out_file.write(_html_head(tvp_records, aga_records).encode("utf-8"))
+    if tvp_records:
+        html_table_section("TVP", tvp_records, out_file)
+    if aga_records:
+        html_table_section("AGA", aga_records, out_file)
+    if not (tvp_records or aga_records):
+        out_file.write(_NO_MARKS.encode("utf-8"))
+    out_file.write(_HTML_TAIL.encode("utf-8"))
 
 class MarkAnalyzerGUI(QWidget):
     def __init__(self):
@@ -236,24 +448,24 @@ class MarkAnalyzerGUI(QWidget):
             QMessageBox.warning(self, "No selection", "Please select at least one mark type (TVP/AGA).")
             return
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-        except Exception as e:
+            tvp_records, aga_records = parse_file(path, analyze_tvp, analyze_aga)
+        except OSError as e:
             QMessageBox.critical(self, "Read error", f"Failed to read file:\n{e}")
             return
-        tvp_records = []
-        aga_records = []
+        except Exception as e:
+            QMessageBox.critical(self, "Parse error", f"Parsing failed:\n{e}")
+            return
         try:
-            if analyze_tvp:
-                tvp_records = parse_marks_from_lines(lines, "_MC_TVP")
-                tvp_records = add_nearest_same_layer(tvp_records)
-            if analyze_aga:
-                aga_records = parse_marks_from_lines(lines, "_MC_AGA")
-                aga_records = add_nearest_same_layer(aga_records)
+            # The KD-tree queries, the numba kernel and the NumPy math release the GIL,
+            # so the two mark types can overlap on separate threads.
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                tvp_future = ex.submit(add_nearest_same_layer, tvp_records)
+                aga_future = ex.submit(add_nearest_same_layer, aga_records)
+                tvp_records = tvp_future.result()
+                aga_records = aga_future.result()
         except Exception as e:
             QMessageBox.critical(self, "Parse error", f"Parsing failed:\n{e}")
             return
-        html = build_html(tvp_records, aga_records)
         out_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save HTML report",
@@ -263,8 +475,8 @@ class MarkAnalyzerGUI(QWidget):
         if not out_path:
             return
         try:
-            with open(out_path, "w", encoding="utf-8") as fo:
-                fo.write(html)
+            with open(out_path, "wb") as fo:
+                write_html(fo, tvp_records, aga_records)
         except Exception as e:
             QMessageBox.critical(self, "Write error", f"Failed to write HTML:\n{e}")
             return
@@ -0,0 +1,70 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled line scanner for mark_analyzer (optional).
+
+Build in place with ``cythonize -i mark_parse.pyx``; mark_analyzer falls back
+to its pure-Python scanner when this module is not importable.
+"""
+from cpython.unicode cimport Py_UNICODE_ISSPACE, Py_UNICODE_ISDECIMAL
+
+
+cdef bint _is_number(str s, Py_ssize_t i, Py_ssize_t n):
+    # Same grammar as mark_analyzer._FLOAT_RE: [-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?
+    cdef Py_ssize_t mant = 0, exp = 0
+    cdef Py_UCS4 c = s[i]
+    if c == u'+' or c == u'-':
+        i += 1
+    while i < n and Py_UNICODE_ISDECIMAL(s[i]):
+        i += 1
+        mant += 1
+    if i < n and s[i] == u'.':
+        i += 1
+        while i < n and Py_UNICODE_ISDECIMAL(s[i]):
+            i += 1
+            mant += 1
+    if mant == 0:
+        return False
+    if i < n and (s[i] == u'e' or s[i] == u'E'):
+        i += 1
+        if i < n and (s[i] == u'+' or s[i] == u'-'):
+            i += 1
+        while i < n and Py_UNICODE_ISDECIMAL(s[i]):
+            i += 1
+            exp += 1
+        if exp == 0:
+            return False
+    return i == n
+
+
+cpdef tuple scan_mark_line(str raw):
+    cdef Py_ssize_t n = len(raw)
+    cdef Py_ssize_t end = n, start, i
+    cdef int found = 0
+    cdef double vals[4]
+    # Walk whitespace-delimited tokens from the right and keep the last four numeric ones.
+    while found < 4:
+        while end > 0 and Py_UNICODE_ISSPACE(raw[end - 1]):
+            end -= 1
+        if end == 0:
+            break
+        start = end
+        while start > 0 and not Py_UNICODE_ISSPACE(raw[start - 1]):
+            start -= 1
+        if _is_number(raw, start, end):
+            vals[found] = float(raw[start:end])
+            found += 1
+        end = start
+    if found < 4:
+        return None
+    # The identifier is the second token on the line.
+    i = 0
+    while i < n and Py_UNICODE_ISSPACE(raw[i]):
+        i += 1
+    while i < n and not Py_UNICODE_ISSPACE(raw[i]):
+        i += 1
+    while i < n and Py_UNICODE_ISSPACE(raw[i]):
+        i += 1
+    start = i
+    while i < n and not Py_UNICODE_ISSPACE(raw[i]):
+        i += 1
+    return raw[start:i], vals[1], vals[0], vals[3], vals[2]